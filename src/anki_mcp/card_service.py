@@ -4,8 +4,10 @@ from fastmcp import FastMCP
 from pydantic import Field
 
 from .common import anki_call
+from .prefetch import InfoPrefetcher, clear_prefetched
 
 card_mcp = FastMCP(name="AnkiCardService")
+cards_info_prefetcher = InfoPrefetcher("cardsInfo", "cards")
 
 
 @card_mcp.tool(
@@ -17,7 +19,9 @@ async def find_cards_tool(
         str, Field(description="Anki search query (e.g., 'deck:current is:new').")
     ],
 ) -> List[int]:
-    return await anki_call("findCards", query=query)
+    result = await anki_call("findCards", query=query)
+    cards_info_prefetcher.schedule(result)
+    return result
 
 
 @card_mcp.tool(
@@ -27,7 +31,7 @@ async def find_cards_tool(
 async def get_cards_info_tool(
     cards: Annotated[List[int], Field(description="A list of card IDs.")],
 ) -> List[Dict[str, Any]]:
-    return await anki_call("cardsInfo", cards=cards)
+    return await cards_info_prefetcher.fetch(cards)
 
 
 @card_mcp.tool(
@@ -76,7 +80,10 @@ async def check_card_suspended_tool(
 async def suspend_cards_tool(
     cards: Annotated[List[int], Field(description="A list of card IDs to suspend.")],
 ) -> bool:
-    return await anki_call("suspend", cards=cards)
+    try:
+        return await anki_call("suspend", cards=cards)
+    finally:
+        clear_prefetched()
 
 
 @card_mcp.tool(
@@ -86,7 +93,10 @@ async def suspend_cards_tool(
 async def unsuspend_cards_tool(
     cards: Annotated[List[int], Field(description="A list of card IDs to unsuspend.")],
 ) -> bool:
-    return await anki_call("unsuspend", cards=cards)
+    try:
+        return await anki_call("unsuspend", cards=cards)
+    finally:
+        clear_prefetched()
 
 
 @card_mcp.tool(
@@ -113,4 +123,15 @@ async def set_specific_card_value_tool(
     params: Dict[str, Any] = {"card": card, "keys": keys, "newValues": newValues}
     if warning_check is not None:
         params["warning_check"] = warning_check
-    return await anki_call("setSpecificValueOfCard", **params)
+    try:
+        return await anki_call("setSpecificValueOfCard", **params)
+    finally:
+        clear_prefetched()
+
+
+@card_mcp.tool(
+    name="prefetchStats",
+    description="Returns statistics for the opt-in prefetching of 'cardsInfo' after searches (enabled via the ANKI_MCP_PREFETCH environment variable): 'enabled', 'prefetchCount', 'prefetched', 'cached', 'hits', 'misses' and 'hitRate'.",
+)
+async def get_prefetch_stats_tool() -> Dict[str, Any]:
+    return cards_info_prefetcher.stats()
@@ -0,0 +1,82 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+SEPARATOR = "::"
+
+
+@dataclass
+class DeckNode:
+    name: str
+    full_name: str
+    id: Optional[int] = None
+    children: Dict[str, "DeckNode"] = field(default_factory=dict)
+
+    def walk(self) -> Iterator["DeckNode"]:
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+    def to_dict(self, depth: Optional[int] = None) -> Dict[str, Any]:
+        children: List[Dict[str, Any]] = []
+        if depth is None or depth > 0:
+            next_depth = None if depth is None else depth - 1
+            children = [child.to_dict(next_depth) for child in self.children.values()]
+        return {
+            "name": self.name,
+            "fullName": self.full_name,
+            "id": self.id,
+            "children": children,
+        }
+
+
+class DeckIndex:
+    """Tree of decks built from AnkiConnect's flat 'deckNamesAndIds' result."""
+
+    def __init__(self, names_and_ids: Dict[str, int]):
+        self.roots: Dict[str, DeckNode] = {}
+        # Keyed by lowercased full name, as Anki deck names are case-insensitive.
+        self._by_name: Dict[str, DeckNode] = {}
+        for full_name in sorted(names_and_ids, key=str.lower):
+            self._insert(full_name).id = names_and_ids[full_name]
+
+    def _insert(self, full_name: str) -> DeckNode:
+        siblings = self.roots
+        path: List[str] = []
+        for part in full_name.split(SEPARATOR):
+            path.append(part)
+            key = SEPARATOR.join(path).lower()
+            node = self._by_name.get(key)
+            if node is None:
+                node = DeckNode(name=part, full_name=SEPARATOR.join(path))
+                siblings[part] = node
+                self._by_name[key] = node
+            siblings = node.children
+            path[-1] = node.name
+        return node
+
+    def get(self, full_name: str) -> DeckNode:
+        """Looks up a deck by its full name, ignoring case."""
+        node = self._by_name.get(full_name.lower())
+        if node is None:
+            raise ValueError(f"Deck '{full_name}' does not exist.")
+        return node
+
+    def subtree_roots(self, root: Optional[str] = None) -> List[DeckNode]:
+        if root is None:
+            return list(self.roots.values())
+        return [self.get(root)]
+
+    def nodes(self, root: Optional[str] = None) -> List[DeckNode]:
+        return [node for top in self.subtree_roots(root) for node in top.walk()]
+
+    def resolve(self, prefix: str) -> List[DeckNode]:
+        """Returns decks whose full name starts with the prefix, ignoring case.
+
+        An exact match, if any, is returned first, followed by the others in tree order.
+        """
+        needle = prefix.lower()
+        matches = [
+            node for node in self.nodes() if node.full_name.lower().startswith(needle)
+        ]
+        matches.sort(key=lambda node: node.full_name.lower() != needle)
+        return matches
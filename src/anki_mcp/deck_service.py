@@ -1,12 +1,41 @@
-from typing import Annotated, Any, Dict, List
+import time
+from typing import Annotated, Any, Dict, List, Optional
 
 from fastmcp import FastMCP
 from pydantic import Field
 
 from .common import anki_call
+from .deck_index import DeckIndex
+from .prefetch import clear_prefetched
 
 deck_mcp = FastMCP(name="AnkiDeckService")
 
+# Cached deck hierarchy; dropped whenever a tool here creates or deletes decks and
+# rebuilt after DECK_INDEX_TTL seconds to pick up changes made outside this server.
+DECK_INDEX_TTL = 60.0
+_deck_index: Optional[DeckIndex] = None
+_deck_index_expires = 0.0
+# Bumped on every invalidation so that a fetch racing a write is not cached.
+_deck_index_generation = 0
+
+
+async def get_deck_index(refresh: bool = False) -> DeckIndex:
+    global _deck_index, _deck_index_expires
+    if _deck_index is None or refresh or time.monotonic() >= _deck_index_expires:
+        generation = _deck_index_generation
+        index = DeckIndex(await anki_call("deckNamesAndIds"))
+        if generation != _deck_index_generation:
+            return index
+        _deck_index = index
+        _deck_index_expires = time.monotonic() + DECK_INDEX_TTL
+    return _deck_index
+
+
+def _invalidate_deck_index() -> None:
+    global _deck_index, _deck_index_generation
+    _deck_index_generation += 1
+    _deck_index = None
+
 
 @deck_mcp.tool(
     name="deckNamesAndIds",
@@ -44,7 +73,10 @@ async def create_deck_tool(
         Field(description="The name of the deck to create (e.g., 'Japanese::Tokyo')."),
     ],
 ) -> int:
-    return await anki_call("createDeck", deck=deck)
+    try:
+        return await anki_call("createDeck", deck=deck)
+    finally:
+        _invalidate_deck_index()
 
 
 @deck_mcp.tool(
@@ -62,7 +94,11 @@ async def delete_decks_tool(
 ) -> None:
     if not cardsToo:
         raise ValueError("cardsToo must be true to delete decks.")
-    return await anki_call("deleteDecks", decks=decks, cardsToo=cardsToo)
+    try:
+        return await anki_call("deleteDecks", decks=decks, cardsToo=cardsToo)
+    finally:
+        clear_prefetched()
+        _invalidate_deck_index()
 
 
 @deck_mcp.tool(
@@ -73,7 +109,11 @@ async def change_deck_tool(
     cards: Annotated[List[int], Field(description="A list of card IDs to move.")],
     deck: Annotated[str, Field(description="The target deck name.")],
 ) -> None:
-    return await anki_call("changeDeck", cards=cards, deck=deck)
+    try:
+        return await anki_call("changeDeck", cards=cards, deck=deck)
+    finally:
+        clear_prefetched()
+        _invalidate_deck_index()
 
 
 @deck_mcp.tool(
@@ -89,3 +129,85 @@ async def save_deck_config_tool(
     ],
 ) -> bool:
     return await anki_call("saveDeckConfig", config=config)
+
+
+@deck_mcp.tool(
+    name="deckTree",
+    description="Gets the deck hierarchy as a tree built from a cached index of deck names. Each node has 'name', 'fullName', 'id' and 'children'. Returns the top-level decks, or only the given root deck and its subdecks. The index is cached for up to a minute, so decks changed outside this server may take that long to appear unless 'refresh' is set.",
+)
+async def get_deck_tree_tool(
+    root: Annotated[
+        Optional[str],
+        Field(
+            description="Optional full deck name to list the subtree of (e.g., 'Japanese')."
+        ),
+    ] = None,
+    depth: Annotated[
+        Optional[int],
+        Field(
+            ge=0,
+            description="Optional number of child levels to include below each returned deck. Decks at the last level have an empty 'children' list.",
+        ),
+    ] = None,
+    refresh: Annotated[
+        Optional[bool],
+        Field(description="Set to true to rebuild the deck index from Anki first."),
+    ] = False,
+) -> List[Dict[str, Any]]:
+    index = await get_deck_index(refresh=bool(refresh))
+    return [node.to_dict(depth) for node in index.subtree_roots(root)]
+
+
+@deck_mcp.tool(
+    name="resolveDeck",
+    description="Finds decks whose full name starts with the given prefix, ignoring case. An exact match is listed first. Returns a list of objects with 'fullName' and 'id'. The index is cached for up to a minute, so decks changed outside this server may take that long to appear unless 'refresh' is set.",
+)
+async def resolve_deck_tool(
+    prefix: Annotated[
+        str, Field(description="Deck name prefix to match (e.g., 'japanese::vo').")
+    ],
+    refresh: Annotated[
+        Optional[bool],
+        Field(description="Set to true to rebuild the deck index from Anki first."),
+    ] = False,
+) -> List[Dict[str, Any]]:
+    index = await get_deck_index(refresh=bool(refresh))
+    return [
+        {"fullName": node.full_name, "id": node.id} for node in index.resolve(prefix)
+    ]
+
+
+@deck_mcp.tool(
+    name="deckCounts",
+    description="Gets new, learn, due and total card counts for every deck in a subtree. The deck list is always re-read from Anki, then all counts are fetched in one further request. Counts of a deck include its subdecks, as in Anki's deck list. Returns a list of objects with 'fullName', 'id', 'new', 'learn', 'due' and 'total'.",
+)
+async def get_deck_counts_tool(
+    root: Annotated[
+        Optional[str],
+        Field(
+            description="Optional full deck name to restrict the counts to its subtree."
+        ),
+    ] = None,
+) -> List[Dict[str, Any]]:
+    # getDeckStats creates decks it does not know, so only pass names that exist now.
+    index = await get_deck_index(refresh=True)
+    nodes = index.nodes(root)
+    existing = [node.full_name for node in nodes if node.id is not None]
+    stats: Dict[str, Dict[str, Any]] = {}
+    if existing:
+        stats = await anki_call("getDeckStats", decks=existing)
+    stats_by_id = {int(deck_id): entry for deck_id, entry in stats.items()}
+    counts: List[Dict[str, Any]] = []
+    for node in nodes:
+        entry = stats_by_id.get(node.id, {}) if node.id is not None else {}
+        counts.append(
+            {
+                "fullName": node.full_name,
+                "id": node.id,
+                "new": entry.get("new_count", 0),
+                "learn": entry.get("learn_count", 0),
+                "due": entry.get("review_count", 0),
+                "total": entry.get("total_in_deck", 0),
+            }
+        )
+    return counts
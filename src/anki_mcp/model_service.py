@@ -1,12 +1,48 @@
-from typing import Annotated, Any, Dict, List, Optional
+import asyncio
+import time
+from typing import Annotated, Any, Dict, List, Optional, Tuple
 
 from fastmcp import FastMCP
 from pydantic import Field
 
 from .common import anki_call
+from .prefetch import clear_prefetched
+from .template_renderer import CompiledModel, compile_model, render_note
 
 model_mcp = FastMCP(name="AnkiModelService")
 
+# Compiled templates keyed by model name; dropped when a tool here modifies the model
+# and recompiled after MODEL_CACHE_TTL seconds to pick up edits made in Anki itself.
+MODEL_CACHE_TTL = 60.0
+_compiled_models: Dict[str, Tuple[CompiledModel, float]] = {}
+# Bumped on every invalidation so that a fetch racing a write is not cached.
+_compiled_models_generation = 0
+
+
+def _invalidate_compiled_model(modelName: Optional[str]) -> None:
+    global _compiled_models_generation
+    _compiled_models_generation += 1
+    _compiled_models.pop(modelName, None)
+
+
+async def get_compiled_model(modelName: str, refresh: bool = False) -> CompiledModel:
+    cached = _compiled_models.get(modelName)
+    if cached is not None and not refresh and time.monotonic() < cached[1]:
+        return cached[0]
+    generation = _compiled_models_generation
+    templates, styling, models = await asyncio.gather(
+        anki_call("modelTemplates", modelName=modelName),
+        anki_call("modelStyling", modelName=modelName),
+        anki_call("findModelsByName", modelNames=[modelName]),
+    )
+    is_cloze = bool(models) and models[0].get("type") == 1
+    compiled = compile_model(
+        modelName, templates, styling.get("css", ""), is_cloze=is_cloze
+    )
+    if generation == _compiled_models_generation:
+        _compiled_models[modelName] = (compiled, time.monotonic() + MODEL_CACHE_TTL)
+    return compiled
+
 
 @model_mcp.tool(
     name="modelNamesAndIds",
@@ -106,7 +142,11 @@ async def update_model_templates_tool(
         ),
     ],
 ) -> None:
-    return await anki_call("updateModelTemplates", model=model)
+    try:
+        return await anki_call("updateModelTemplates", model=model)
+    finally:
+        clear_prefetched()
+        _invalidate_compiled_model(model.get("name"))
 
 
 @model_mcp.tool(
@@ -121,7 +161,11 @@ async def update_model_styling_tool(
         ),
     ],
 ) -> None:
-    return await anki_call("updateModelStyling", model=model)
+    try:
+        return await anki_call("updateModelStyling", model=model)
+    finally:
+        clear_prefetched()
+        _invalidate_compiled_model(model.get("name"))
 
 
 @model_mcp.tool(
@@ -138,7 +182,11 @@ async def add_model_field_tool(
     params: Dict[str, Any] = {"modelName": modelName, "fieldName": fieldName}
     if index is not None:
         params["index"] = index
-    return await anki_call("modelFieldAdd", **params)
+    try:
+        return await anki_call("modelFieldAdd", **params)
+    finally:
+        clear_prefetched()
+        _invalidate_compiled_model(modelName)
 
 
 @model_mcp.tool(
@@ -148,4 +196,42 @@ async def remove_model_field_tool(
     modelName: Annotated[str, Field(description="Name of the model to modify.")],
     fieldName: Annotated[str, Field(description="Name of the field to remove.")],
 ) -> None:
-    return await anki_call("modelFieldRemove", modelName=modelName, fieldName=fieldName)
+    try:
+        return await anki_call(
+            "modelFieldRemove", modelName=modelName, fieldName=fieldName
+        )
+    finally:
+        clear_prefetched()
+        _invalidate_compiled_model(modelName)
+
+
+@model_mcp.tool(
+    name="renderNotes",
+    description="Renders the question and answer HTML of every card the given notes would produce, without adding them to the collection. Templates and CSS are fetched once per model and rendered locally; they are cached for up to a minute, so edits made in Anki itself may take that long to show unless 'refresh' is set. Returns an object with the model 'css' and 'notes', a list (one entry per input note) of cards with 'ord', 'template', 'question' and 'answer'.",
+)
+async def render_notes_tool(
+    modelName: Annotated[str, Field(description="The name of the model.")],
+    notes: Annotated[
+        List[Dict[str, Any]],
+        Field(
+            description="A list of note objects. Each must include 'fields' (field name to value) and may include 'tags' and 'deckName'."
+        ),
+    ],
+    refresh: Annotated[
+        Optional[bool],
+        Field(description="Set to true to re-fetch the model's templates first."),
+    ] = False,
+) -> Dict[str, Any]:
+    compiled = await get_compiled_model(modelName, refresh=bool(refresh))
+    return {
+        "css": compiled.css,
+        "notes": [
+            render_note(
+                compiled,
+                note.get("fields", {}),
+                tags=note.get("tags", []),
+                deck_name=note.get("deckName", ""),
+            )
+            for note in notes
+        ],
+    }
@@ -4,8 +4,10 @@ from fastmcp import FastMCP
 from pydantic import Field
 
 from .common import anki_call
+from .prefetch import InfoPrefetcher, clear_prefetched
 
 note_mcp = FastMCP(name="AnkiNoteService")
+notes_info_prefetcher = InfoPrefetcher("notesInfo", "notes")
 
 
 @note_mcp.tool(
@@ -17,7 +19,9 @@ async def find_notes_tool(
         str, Field(description="Anki search query (e.g., 'deck:current card:1').")
     ],
 ) -> List[int]:
-    return await anki_call("findNotes", query=query)
+    result = await anki_call("findNotes", query=query)
+    notes_info_prefetcher.schedule(result)
+    return result
 
 
 @note_mcp.tool(
@@ -27,7 +31,7 @@ async def find_notes_tool(
 async def get_notes_info_tool(
     notes: Annotated[List[int], Field(description="A list of note IDs.")],
 ) -> List[Dict[str, Any]]:
-    return await anki_call("notesInfo", notes=notes)
+    return await notes_info_prefetcher.fetch(notes)
 
 
 @note_mcp.tool(
@@ -66,14 +70,20 @@ async def update_note_fields_tool(
         ),
     ],
 ) -> None:
-    return await anki_call("updateNoteFields", note=note)
+    try:
+        return await anki_call("updateNoteFields", note=note)
+    finally:
+        clear_prefetched()
 
 
 @note_mcp.tool(name="deleteNotes", description="Deletes notes with the given IDs.")
 async def delete_notes_tool(
     notes: Annotated[List[int], Field(description="A list of note IDs to delete.")],
 ) -> None:
-    return await anki_call("deleteNotes", notes=notes)
+    try:
+        return await anki_call("deleteNotes", notes=notes)
+    finally:
+        clear_prefetched()
 
 
 @note_mcp.tool(
@@ -100,7 +110,10 @@ async def add_tags_tool(
         ),
     ],
 ) -> None:
-    return await anki_call("addTags", notes=notes, tags=tags)
+    try:
+        return await anki_call("addTags", notes=notes, tags=tags)
+    finally:
+        clear_prefetched()
 
 
 @note_mcp.tool(name="removeTags", description="Removes tags from the specified notes.")
@@ -112,7 +125,10 @@ async def remove_tags_tool(
         str, Field(description="A space-separated string of tags to remove.")
     ],
 ) -> None:
-    return await anki_call("removeTags", notes=notes, tags=tags)
+    try:
+        return await anki_call("removeTags", notes=notes, tags=tags)
+    finally:
+        clear_prefetched()
 
 
 @note_mcp.tool(
@@ -127,4 +143,15 @@ async def update_note_tool(
         ),
     ],
 ) -> None:
-    return await anki_call("updateNote", note=note)
+    try:
+        return await anki_call("updateNote", note=note)
+    finally:
+        clear_prefetched()
+
+
+@note_mcp.tool(
+    name="prefetchStats",
+    description="Returns statistics for the opt-in prefetching of 'notesInfo' after searches (enabled via the ANKI_MCP_PREFETCH environment variable): 'enabled', 'prefetchCount', 'prefetched', 'cached', 'hits', 'misses' and 'hitRate'.",
+)
+async def get_prefetch_stats_tool() -> Dict[str, Any]:
+    return notes_info_prefetcher.stats()
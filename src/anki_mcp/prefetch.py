@@ -0,0 +1,140 @@
+import asyncio
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Set, Tuple
+
+from .common import anki_call
+
+
+def _prefetch_count_from_env() -> int:
+    value = os.environ.get("ANKI_MCP_PREFETCH") or "0"
+    try:
+        return max(int(value), 0)
+    except ValueError:
+        print(
+            f"Ignoring invalid ANKI_MCP_PREFETCH={value!r}; prefetching is disabled.",
+            file=sys.stderr,
+        )
+        return 0
+
+
+# Number of leading search results to prefetch info for; 0 (the default) disables it.
+PREFETCH_COUNT = _prefetch_count_from_env()
+PREFETCH_TTL = 10.0
+PREFETCH_MAX_IDS = 2000
+
+_prefetchers: List["InfoPrefetcher"] = []
+
+
+class InfoPrefetcher:
+    """Fetches info for the first IDs of a search result in the background.
+
+    Prefetched entries are consumed by the next info call that asks for them and
+    expire after a short TTL, so they only bridge a search and its follow-up call.
+    """
+
+    def __init__(
+        self,
+        action: str,
+        param: str,
+        count: int = PREFETCH_COUNT,
+        ttl: float = PREFETCH_TTL,
+        max_ids: int = PREFETCH_MAX_IDS,
+    ):
+        self.action = action
+        self.param = param
+        self.count = count
+        self.ttl = ttl
+        self.max_ids = max_ids
+        self._entries: "OrderedDict[int, Tuple[float, asyncio.Task[Any], int]]" = (
+            OrderedDict()
+        )
+        # The event loop only holds weak references to tasks, so keep in-flight ones.
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+        self.prefetched = 0
+        self.hits = 0
+        self.misses = 0
+        _prefetchers.append(self)
+
+    @property
+    def enabled(self) -> bool:
+        return self.count > 0
+
+    def schedule(self, ids: List[int]) -> None:
+        if not self.enabled or not ids:
+            return
+        self._purge_expired()
+        batch = list(dict.fromkeys(ids[: self.count]))
+        task = asyncio.create_task(anki_call(self.action, **{self.param: batch}))
+        self._tasks.add(task)
+        task.add_done_callback(self._task_done)
+        expires = time.monotonic() + self.ttl
+        for position, item_id in enumerate(batch):
+            self._entries.pop(item_id, None)
+            self._entries[item_id] = (expires, task, position)
+        self.prefetched += len(batch)
+        while len(self._entries) > self.max_ids:
+            self._entries.popitem(last=False)
+
+    def _task_done(self, task: "asyncio.Task[Any]") -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            # Mark the exception as retrieved; fetch() falls back to Anki on failure.
+            task.exception()
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry[0] < now]
+        for key in expired:
+            del self._entries[key]
+
+    async def fetch(self, ids: List[int]) -> List[Any]:
+        if not self.enabled:
+            return await anki_call(self.action, **{self.param: ids})
+        now = time.monotonic()
+        results: Dict[int, Any] = {}
+        for item_id in dict.fromkeys(ids):
+            entry = self._entries.pop(item_id, None)
+            if entry is None or entry[0] < now:
+                continue
+            _, task, position = entry
+            try:
+                # Shielded so that cancelling one caller does not cancel the request
+                # that other callers share.
+                results[item_id] = (await asyncio.shield(task))[position]
+            except asyncio.CancelledError:
+                if not task.cancelled():
+                    raise
+            except Exception:
+                continue
+        missing = [item_id for item_id in dict.fromkeys(ids) if item_id not in results]
+        self.hits += len(results)
+        self.misses += len(missing)
+        if missing:
+            fetched = await anki_call(self.action, **{self.param: missing})
+            results.update(zip(missing, fetched))
+        return [results[item_id] for item_id in ids]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        self._purge_expired()
+        requested = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "prefetchCount": self.count,
+            "prefetched": self.prefetched,
+            "cached": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hitRate": self.hits / requested if requested else 0.0,
+        }
+
+
+def clear_prefetched() -> None:
+    """Drops all prefetched info; called by tools that modify notes or cards."""
+    for prefetcher in _prefetchers:
+        prefetcher.clear()
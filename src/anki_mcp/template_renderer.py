@@ -0,0 +1,343 @@
+import html
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+_TAG_RE = re.compile(r"\{\{(.*?)\}\}", re.DOTALL)
+_CLOZE_TOKEN_RE = re.compile(r"\{\{c(\d+)::|\}\}")
+_HTML_RE = re.compile(r"<[^>]*>")
+# Anki treats a field as empty when it holds nothing but whitespace and line breaks.
+_EMPTY_FIELD_RE = re.compile(r"^(?:\s|&nbsp;|</?(?:br|div)\s*/?>)*$", re.IGNORECASE)
+_FURIGANA_RE = re.compile(r" ?([^ >]+?)\[(.+?)\]")
+
+SPECIAL_FIELDS = ("FrontSide", "Tags", "Type", "Deck", "Subdeck", "Card")
+
+
+@dataclass(frozen=True)
+class _Text:
+    text: str
+
+
+@dataclass(frozen=True)
+class _Replacement:
+    field_name: str
+    filters: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _Conditional:
+    field_name: str
+    negated: bool
+    children: Tuple["_Node", ...]
+
+
+_Node = Union[_Text, _Replacement, _Conditional]
+
+
+@dataclass(frozen=True)
+class _Cloze:
+    ord: int
+    content: Tuple[Union[str, "_Cloze"], ...]
+    hint: Optional[str]
+
+
+_ClozeNode = Union[str, _Cloze]
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    name: str
+    ord: int
+    question: Tuple[_Node, ...]
+    answer: Tuple[_Node, ...]
+
+
+@dataclass(frozen=True)
+class CompiledModel:
+    name: str
+    templates: Tuple[CompiledTemplate, ...]
+    css: str
+    is_cloze: bool
+    cloze_fields: Tuple[str, ...]
+
+
+@dataclass
+class _RenderState:
+    fields: Dict[str, str]
+    cloze_ord: int
+    answer: bool
+    has_content: bool = False
+
+
+def compile_template(source: str) -> Tuple[_Node, ...]:
+    """Parses an Anki card template into a tree of text, field and conditional nodes."""
+    root: List[_Node] = []
+    current = root
+    stack: List[Tuple[str, bool, List[_Node]]] = []
+    pos = 0
+    for match in _TAG_RE.finditer(source):
+        if match.start() > pos:
+            current.append(_Text(source[pos : match.start()]))
+        pos = match.end()
+        tag = match.group(1).strip()
+        if tag[:1] in ("#", "^"):
+            stack.append((tag[1:].strip(), tag[0] == "^", current))
+            current = []
+        elif tag[:1] == "/":
+            name = tag[1:].strip()
+            if not stack or stack[-1][0] != name:
+                raise ValueError(
+                    f"Unexpected closing tag '{{{{/{name}}}}}' in template."
+                )
+            open_name, negated, parent = stack.pop()
+            parent.append(_Conditional(open_name, negated, tuple(current)))
+            current = parent
+        else:
+            *filters, name = tag.split(":")
+            current.append(
+                _Replacement(name.strip(), tuple(f.strip() for f in filters))
+            )
+    if stack:
+        raise ValueError(
+            f"Missing closing tag for '{{{{#{stack[-1][0]}}}}}' in template."
+        )
+    if pos < len(source):
+        current.append(_Text(source[pos:]))
+    return tuple(root)
+
+
+def _find_cloze_fields(nodes: Iterable[_Node]) -> Set[str]:
+    found: Set[str] = set()
+    for node in nodes:
+        if isinstance(node, _Replacement) and "cloze" in node.filters:
+            found.add(node.field_name)
+        elif isinstance(node, _Conditional):
+            found |= _find_cloze_fields(node.children)
+    return found
+
+
+def compile_model(
+    name: str,
+    templates: Dict[str, Dict[str, str]],
+    css: str = "",
+    is_cloze: bool = False,
+) -> CompiledModel:
+    """Compiles the output of AnkiConnect's 'modelTemplates' into a reusable model.
+
+    'is_cloze' must reflect the model type, as reported by 'findModelsByName'.
+    """
+    compiled = tuple(
+        CompiledTemplate(
+            name=template_name,
+            ord=ord_,
+            question=compile_template(sides.get("Front", "")),
+            answer=compile_template(sides.get("Back", "")),
+        )
+        for ord_, (template_name, sides) in enumerate(templates.items())
+    )
+    cloze_fields: Set[str] = set()
+    if is_cloze and compiled:
+        cloze_fields = _find_cloze_fields(compiled[0].question)
+    return CompiledModel(
+        name=name,
+        templates=compiled,
+        css=css,
+        is_cloze=is_cloze,
+        cloze_fields=tuple(sorted(cloze_fields)),
+    )
+
+
+def _strip_html(text: str) -> str:
+    return html.unescape(_HTML_RE.sub("", text))
+
+
+def _field_is_empty(text: str) -> bool:
+    return _EMPTY_FIELD_RE.match(text) is not None
+
+
+def _split_hint(content: List[_ClozeNode]) -> Tuple[List[_ClozeNode], Optional[str]]:
+    if content and isinstance(content[-1], str) and "::" in content[-1]:
+        text, hint = content[-1].split("::", 1)
+        return content[:-1] + [text], hint
+    return content, None
+
+
+def _parse_clozes(text: str) -> Tuple[_ClozeNode, ...]:
+    """Splits a field into plain text and (possibly nested) cloze deletions."""
+    root: List[_ClozeNode] = []
+    current = root
+    stack: List[Tuple[int, List[_ClozeNode]]] = []
+    pos = 0
+    for match in _CLOZE_TOKEN_RE.finditer(text):
+        if match.group(1) is None and not stack:
+            continue
+        if match.start() > pos:
+            current.append(text[pos : match.start()])
+        pos = match.end()
+        if match.group(1) is not None:
+            stack.append((int(match.group(1)), current))
+            current = []
+        else:
+            ord_, parent = stack.pop()
+            content, hint = _split_hint(current)
+            parent.append(_Cloze(ord_, tuple(content), hint))
+            current = parent
+    if pos < len(text):
+        current.append(text[pos:])
+    # Unterminated clozes are shown as typed, like Anki does.
+    while stack:
+        ord_, parent = stack.pop()
+        parent.append(f"{{{{c{ord_}::")
+        parent.extend(current)
+        current = parent
+    return tuple(root)
+
+
+def _collect_cloze_ords(nodes: Iterable[_ClozeNode], ords: Set[int]) -> Set[int]:
+    for node in nodes:
+        if isinstance(node, _Cloze):
+            ords.add(node.ord)
+            _collect_cloze_ords(node.content, ords)
+    return ords
+
+
+def _render_cloze_nodes(
+    nodes: Iterable[_ClozeNode], ord_: Optional[int], answer: bool
+) -> str:
+    out: List[str] = []
+    for node in nodes:
+        if isinstance(node, str):
+            out.append(node)
+        elif node.ord != ord_:
+            out.append(_render_cloze_nodes(node.content, ord_, answer))
+        elif answer:
+            content = _render_cloze_nodes(node.content, ord_, answer)
+            out.append(f'<span class="cloze">{content}</span>')
+        else:
+            out.append(f'<span class="cloze">[{node.hint or "..."}]</span>')
+    return "".join(out)
+
+
+def _render_cloze(text: str, ord_: Optional[int], answer: bool) -> str:
+    nodes = _parse_clozes(text)
+    if ord_ not in _collect_cloze_ords(nodes, set()):
+        return ""
+    return _render_cloze_nodes(nodes, ord_, answer)
+
+
+def _render_cloze_only(text: str, ord_: Optional[int]) -> str:
+    active: List[str] = []
+
+    def visit(nodes: Iterable[_ClozeNode]) -> None:
+        for node in nodes:
+            if not isinstance(node, _Cloze):
+                continue
+            if node.ord == ord_:
+                active.append(_render_cloze_nodes(node.content, None, True))
+            else:
+                visit(node.content)
+
+    visit(_parse_clozes(text))
+    return ", ".join(active)
+
+
+def _apply_filter(name: str, value: str, field_name: str, state: _RenderState) -> str:
+    if name == "text":
+        return _strip_html(value)
+    if name == "cloze":
+        return _render_cloze(value, state.cloze_ord, state.answer)
+    if name == "cloze-only":
+        return _render_cloze_only(value, state.cloze_ord)
+    if name == "hint":
+        if not value.strip():
+            return ""
+        return (
+            f'<a class="hint" href="#" onclick="this.style.display=\'none\';'
+            f"this.nextSibling.style.display='block';return false;\">"
+            f'{field_name}</a><div class="hint" style="display: none">{value}</div>'
+        )
+    if name == "type":
+        return f"[[type:{field_name}]]"
+    if name == "furigana":
+        return _FURIGANA_RE.sub(r"<ruby><rb>\1</rb><rt>\2</rt></ruby>", value)
+    if name == "kana":
+        return _FURIGANA_RE.sub(r"\2", value)
+    if name == "kanji":
+        return _FURIGANA_RE.sub(r"\1", value)
+    # Unknown filters are usually provided by add-ons; leave the value untouched.
+    return value
+
+
+def _render_nodes(nodes: Iterable[_Node], state: _RenderState) -> str:
+    out: List[str] = []
+    for node in nodes:
+        if isinstance(node, _Text):
+            out.append(node.text)
+        elif isinstance(node, _Replacement):
+            value = state.fields.get(node.field_name, "")
+            if node.field_name not in SPECIAL_FIELDS and not _field_is_empty(value):
+                state.has_content = True
+            for filter_name in reversed(node.filters):
+                value = _apply_filter(filter_name, value, node.field_name, state)
+            out.append(value)
+        else:
+            empty = _field_is_empty(state.fields.get(node.field_name, ""))
+            if empty == node.negated:
+                out.append(_render_nodes(node.children, state))
+    return "".join(out)
+
+
+def _cloze_ords(model: CompiledModel, fields: Dict[str, str]) -> List[int]:
+    ords: Set[int] = set()
+    for field_name in model.cloze_fields:
+        _collect_cloze_ords(_parse_clozes(fields.get(field_name, "")), ords)
+    return sorted(ords)
+
+
+def render_note(
+    model: CompiledModel,
+    fields: Dict[str, Any],
+    tags: Iterable[str] = (),
+    deck_name: str = "",
+) -> List[Dict[str, Any]]:
+    """Renders every card a note with the given fields would generate.
+
+    Cards whose front side would be empty are skipped, as Anki would not create them.
+    """
+    base_fields = {
+        name: "" if value is None else str(value) for name, value in fields.items()
+    }
+    base_fields["Tags"] = " ".join(str(tag) for tag in tags)
+    base_fields["Type"] = model.name
+    base_fields["Deck"] = deck_name
+    base_fields["Subdeck"] = deck_name.split("::")[-1]
+
+    if model.is_cloze:
+        template = model.templates[0]
+        jobs = [(template, n, n - 1) for n in _cloze_ords(model, base_fields)]
+    else:
+        # Like Anki, a cloze filter on a standard card reveals the card's own number.
+        jobs = [
+            (template, template.ord + 1, template.ord) for template in model.templates
+        ]
+
+    cards: List[Dict[str, Any]] = []
+    for template, cloze_ord, card_ord in jobs:
+        card_fields = {**base_fields, "Card": template.name}
+        front_state = _RenderState(card_fields, cloze_ord, answer=False)
+        question = _render_nodes(template.question, front_state)
+        if not model.is_cloze and not front_state.has_content:
+            continue
+        back_state = _RenderState(
+            {**card_fields, "FrontSide": question}, cloze_ord, answer=True
+        )
+        answer = _render_nodes(template.answer, back_state)
+        cards.append(
+            {
+                "ord": card_ord,
+                "template": template.name,
+                "question": question,
+                "answer": answer,
+            }
+        )
+    return cards
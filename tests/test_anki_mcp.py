@@ -30,6 +30,9 @@ async def test_list_tools(anki: Client):
         "deck_deleteDecks",
         "deck_changeDeck",
         "deck_saveDeckConfig",
+        "deck_deckTree",
+        "deck_resolveDeck",
+        "deck_deckCounts",
         # Note Service
         "note_findNotes",
         "note_notesInfo",
@@ -41,6 +44,7 @@ async def test_list_tools(anki: Client):
         "note_addTags",
         "note_removeTags",
         "note_updateNote",
+        "note_prefetchStats",
         # Card Service
         "card_findCards",
         "card_cardsInfo",
@@ -51,6 +55,7 @@ async def test_list_tools(anki: Client):
         "card_suspend",
         "card_unsuspend",
         "card_setSpecificValueOfCard",
+        "card_prefetchStats",
         # Model Service
         "model_modelNamesAndIds",
         "model_findModelsByName",
@@ -62,6 +67,7 @@ async def test_list_tools(anki: Client):
         "model_updateModelStyling",
         "model_modelFieldAdd",
         "model_modelFieldRemove",
+        "model_renderNotes",
         # Media Service
         "media_retrieveMediaFile",
         "media_getMediaFilesNames",
@@ -0,0 +1,73 @@
+import pytest
+
+from src.anki_mcp.deck_index import DeckIndex
+
+DECKS = {
+    "Default": 1,
+    "Japanese": 2,
+    "Japanese::Vocab": 3,
+    "Japanese::Vocab::N5": 4,
+    "Japanese::Grammar": 5,
+    "japan": 6,
+    "French::Verbs": 7,
+}
+
+
+def test_builds_tree_with_implicit_parents():
+    index = DeckIndex(DECKS)
+
+    assert list(index.roots) == ["Default", "French", "japan", "Japanese"]
+    assert index.get("French").id is None
+    assert index.get("French::Verbs").id == 7
+    assert list(index.get("Japanese").children) == ["Grammar", "Vocab"]
+    with pytest.raises(ValueError):
+        index.get("Spanish")
+
+
+def test_lookup_ignores_case():
+    index = DeckIndex({"Japanese": 2, "japanese::Vocab": 3})
+
+    assert index.get("japanese").id == 2
+    assert index.get("JAPANESE::VOCAB").full_name == "Japanese::Vocab"
+    assert list(index.roots) == ["Japanese"]
+    assert [node.full_name for node in index.nodes("jApAnEsE")] == [
+        "Japanese",
+        "Japanese::Vocab",
+    ]
+
+
+def test_subtree_and_depth():
+    index = DeckIndex(DECKS)
+
+    assert [node.full_name for node in index.nodes("Japanese::Vocab")] == [
+        "Japanese::Vocab",
+        "Japanese::Vocab::N5",
+    ]
+    (tree,) = [node.to_dict(1) for node in index.subtree_roots("Japanese")]
+    assert [child["fullName"] for child in tree["children"]] == [
+        "Japanese::Grammar",
+        "Japanese::Vocab",
+    ]
+    assert all(child["children"] == [] for child in tree["children"])
+    assert index.get("Japanese").to_dict(0)["children"] == []
+    full = index.get("Japanese").to_dict()
+    assert full["children"][1]["children"][0]["fullName"] == "Japanese::Vocab::N5"
+
+
+def test_resolve_lists_exact_match_first():
+    index = DeckIndex(DECKS)
+
+    assert [node.full_name for node in index.resolve("JAPANESE")] == [
+        "Japanese",
+        "Japanese::Grammar",
+        "Japanese::Vocab",
+        "Japanese::Vocab::N5",
+    ]
+    assert [node.full_name for node in index.resolve("japan")] == [
+        "japan",
+        "Japanese",
+        "Japanese::Grammar",
+        "Japanese::Vocab",
+        "Japanese::Vocab::N5",
+    ]
+    assert index.resolve("Spanish") == []
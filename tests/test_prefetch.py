@@ -0,0 +1,141 @@
+import asyncio
+from typing import Any, Dict, List, Tuple
+
+import pytest
+
+from src.anki_mcp import prefetch
+from src.anki_mcp.prefetch import InfoPrefetcher, clear_prefetched
+
+
+class FakeAnki:
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, Dict[str, Any]]] = []
+        self.fail = False
+        self.delay = 0.0
+
+    async def __call__(self, action: str, **params: Any) -> Any:
+        self.calls.append((action, params))
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise Exception("AnkiConnect unavailable")
+        return [{"noteId": note} for note in params["notes"]]
+
+
+@pytest.fixture
+def anki(monkeypatch: pytest.MonkeyPatch) -> FakeAnki:
+    fake = FakeAnki()
+    monkeypatch.setattr(prefetch, "anki_call", fake)
+    return fake
+
+
+@pytest.mark.asyncio
+async def test_prefetched_ids_are_hits(anki):
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=3)
+
+    prefetcher.schedule([1, 2, 3, 4, 5])
+    result = await prefetcher.fetch([1, 2, 4, 1])
+
+    assert result == [{"noteId": 1}, {"noteId": 2}, {"noteId": 4}, {"noteId": 1}]
+    assert anki.calls == [
+        ("notesInfo", {"notes": [1, 2, 3]}),
+        ("notesInfo", {"notes": [4]}),
+    ]
+    stats = prefetcher.stats()
+    assert (stats["hits"], stats["misses"], stats["hitRate"]) == (2, 1, 2 / 3)
+    assert stats["cached"] == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_are_consumed_once(anki):
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=2)
+
+    prefetcher.schedule([1, 2])
+    await prefetcher.fetch([1])
+    await prefetcher.fetch([1])
+
+    assert (prefetcher.hits, prefetcher.misses) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_used(anki):
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=2, ttl=-1)
+
+    prefetcher.schedule([1, 2])
+    assert prefetcher.stats()["cached"] == 0
+    assert await prefetcher.fetch([1]) == [{"noteId": 1}]
+    assert (prefetcher.hits, prefetcher.misses) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_clear_prefetched(anki):
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=2)
+
+    prefetcher.schedule([1, 2])
+    clear_prefetched()
+    await prefetcher.fetch([1, 2])
+
+    assert (prefetcher.hits, prefetcher.misses) == (0, 2)
+    assert anki.calls[-1] == ("notesInfo", {"notes": [1, 2]})
+
+
+@pytest.mark.asyncio
+async def test_failed_prefetch_falls_back_to_anki(anki):
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=2)
+
+    anki.fail = True
+    prefetcher.schedule([1, 2])
+    await asyncio.sleep(0.01)
+    anki.fail = False
+
+    assert await prefetcher.fetch([1, 2]) == [{"noteId": 1}, {"noteId": 2}]
+    assert (prefetcher.hits, prefetcher.misses) == (0, 2)
+    assert len(anki.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_prefetch(anki):
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=2)
+
+    anki.delay = 0.01
+    prefetcher.schedule([1, 2])
+    first = asyncio.create_task(prefetcher.fetch([1]))
+    second = asyncio.create_task(prefetcher.fetch([2]))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == [{"noteId": 2}]
+    with pytest.raises(asyncio.CancelledError):
+        await first
+    assert (prefetcher.hits, prefetcher.misses) == (1, 0)
+    assert len(anki.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_prefetch_falls_back_to_anki(anki):
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=2)
+
+    anki.delay = 0.01
+    prefetcher.schedule([1, 2])
+    for task in list(prefetcher._tasks):
+        task.cancel()
+
+    assert await prefetcher.fetch([1, 2]) == [{"noteId": 1}, {"noteId": 2}]
+    assert (prefetcher.hits, prefetcher.misses) == (0, 2)
+
+
+def test_disabled_when_count_is_zero():
+    prefetcher = InfoPrefetcher("notesInfo", "notes", count=0)
+
+    prefetcher.schedule([1, 2])
+
+    assert prefetcher.stats()["enabled"] is False
+    assert prefetcher.stats()["cached"] == 0
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"), [("25", 25), ("yes", 0), ("-3", 0), ("", 0)]
+)
+def test_prefetch_count_from_env(monkeypatch, value, expected):
+    monkeypatch.setenv("ANKI_MCP_PREFETCH", value)
+
+    assert prefetch._prefetch_count_from_env() == expected
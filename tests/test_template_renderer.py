@@ -0,0 +1,107 @@
+import pytest
+
+from src.anki_mcp.template_renderer import compile_model, compile_template, render_note
+
+BASIC_AND_REVERSED = {
+    "Card 1": {"Front": "{{Front}}", "Back": "{{FrontSide}}<hr id=answer>{{Back}}"},
+    "Card 2": {"Front": "{{Back}}", "Back": "{{FrontSide}}<hr id=answer>{{Front}}"},
+}
+OPTIONAL_REVERSED = {
+    "Card 1": {"Front": "{{Front}}", "Back": "{{Back}}"},
+    "Card 2": {
+        "Front": "{{#Add Reverse}}{{Back}}{{/Add Reverse}}",
+        "Back": "{{Front}}",
+    },
+}
+CLOZE = {"Cloze": {"Front": "{{cloze:Text}}", "Back": "{{cloze:Text}}<br>{{Extra}}"}}
+
+
+def test_basic_and_reversed_cards():
+    model = compile_model("Basic (and reversed card)", BASIC_AND_REVERSED)
+    cards = render_note(model, {"Front": "hi", "Back": "<b>yo</b>"})
+
+    assert [(card["ord"], card["template"]) for card in cards] == [
+        (0, "Card 1"),
+        (1, "Card 2"),
+    ]
+    assert cards[0]["question"] == "hi"
+    assert cards[0]["answer"] == "hi<hr id=answer><b>yo</b>"
+    assert cards[1]["question"] == "<b>yo</b>"
+    assert cards[1]["answer"] == "<b>yo</b><hr id=answer>hi"
+
+
+def test_empty_fronts_are_skipped():
+    model = compile_model("Basic (optional reversed card)", OPTIONAL_REVERSED)
+
+    without_reverse = render_note(model, {"Front": "a", "Back": "b", "Add Reverse": ""})
+    with_reverse = render_note(model, {"Front": "a", "Back": "b", "Add Reverse": "y"})
+
+    assert [card["ord"] for card in without_reverse] == [0]
+    assert [card["ord"] for card in with_reverse] == [0, 1]
+    assert with_reverse[1]["question"] == "b"
+
+
+def test_picture_only_fields_are_not_empty():
+    model = compile_model("Basic (optional reversed card)", OPTIONAL_REVERSED)
+    picture = '<img src="x.jpg">'
+
+    cards = render_note(model, {"Front": picture, "Back": "b", "Add Reverse": picture})
+    blank = render_note(
+        model, {"Front": " <br>&nbsp;<div></div>", "Back": "b", "Add Reverse": "<br/>"}
+    )
+
+    assert [card["question"] for card in cards] == [picture, "b"]
+    assert blank == []
+
+
+def test_special_fields_and_non_string_values():
+    model = compile_model(
+        "Basic",
+        {"Card 1": {"Front": "{{Front}} {{Tags}} {{Subdeck}}", "Back": "{{Type}}"}},
+    )
+
+    (card,) = render_note(model, {"Front": 1}, tags=["a", "b"], deck_name="A::B")
+
+    assert card["question"] == "1 a b B"
+    assert card["answer"] == "Basic"
+
+
+def test_cloze_cards_per_ord():
+    model = compile_model("Cloze", CLOZE, is_cloze=True)
+    cards = render_note(
+        model, {"Text": "{{c1::Paris::city}} is in {{c2::France}}", "Extra": ""}
+    )
+
+    assert [card["ord"] for card in cards] == [0, 1]
+    assert cards[0]["question"] == '<span class="cloze">[city]</span> is in France'
+    assert cards[0]["answer"] == '<span class="cloze">Paris</span> is in France<br>'
+    assert cards[1]["question"] == 'Paris is in <span class="cloze">[...]</span>'
+
+
+def test_nested_cloze():
+    model = compile_model("Cloze", CLOZE, is_cloze=True)
+    cards = render_note(model, {"Text": "{{c1::a {{c2::b}} }}"})
+
+    assert [card["ord"] for card in cards] == [0, 1]
+    assert cards[0]["question"] == '<span class="cloze">[...]</span>'
+    assert cards[0]["answer"].startswith('<span class="cloze">a b </span>')
+    assert cards[1]["question"] == 'a <span class="cloze">[...]</span> '
+    assert cards[1]["answer"].startswith('a <span class="cloze">b</span> ')
+
+
+def test_cloze_filter_on_standard_model():
+    model = compile_model("Basic", {"Card 1": {"Front": "{{cloze:Text}}", "Back": ""}})
+    cards = render_note(model, {"Text": "{{c1::x}} {{c2::y}}"})
+
+    assert not model.is_cloze
+    assert [card["question"] for card in cards] == [
+        '<span class="cloze">[...]</span> y'
+    ]
+
+
+@pytest.mark.parametrize(
+    "source", ["{{#A}}x", "x{{/A}}", "{{#A}}{{^B}}{{/A}}{{/B}}"]
+)
+def test_unbalanced_tags_raise(source: str):
+    with pytest.raises(ValueError):
+        compile_template(source)